@@ -0,0 +1,143 @@
+package jpacman.fuzzing;
+
+import java.awt.Window;
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.FileInputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.security.Permission;
+
+import jpacman.controller.Pacman;
+
+/**
+ * Keeps a single JVM alive for the fuzzer.
+ * <p>
+ * Reads one case per line from stdin as {@code <case id>\t<map path>\t<action sequence>}, runs JPacman in-process
+ * and answers with a {@code RC=<exit code> <output length> <case id>} line followed by the captured output (UTF-8
+ * bytes). The case id is echoed back as is, so answers can be matched to their case.
+ * <p>
+ * A case which doesn't end in {@link System#exit(int)} would have left a fresh JVM hanging on JPacman's Swing timers.
+ * It is answered with {@code RC=timeout} instead, after which the launcher exits, as those timers keep running in
+ * this JVM too. The fuzzer starts a new launcher for the next case.
+ * <p>
+ * With {@code --batch <index file>}, the cases are read from the index file instead and the JVM exits afterwards.
+ * <p>
+ * Only the answers are written to stdout. Between cases, {@link System#out} and {@link System#err} point at the
+ * original stderr, so output of lingering JPacman threads can't end up in the middle of an answer.
+ * <p>
+ * Installing the exit trap requires {@code -Djava.security.manager=allow} on Java 18 and later.
+ */
+public final class FuzzerLauncher {
+
+    private FuzzerLauncher() {
+    }
+
+    /**
+     * Thrown instead of letting {@link System#exit(int)} terminate the JVM.
+     */
+    private static final class ExitTrappedException extends SecurityException {
+        private static final long serialVersionUID = 1L;
+    }
+
+    /**
+     * Security manager which only traps calls to {@link System#exit(int)}.
+     */
+    private static final class ExitTrap extends SecurityManager {
+        private volatile Integer status;
+
+        @Override
+        public void checkExit(int status) {
+            if (this.status == null) {
+                this.status = status;
+            }
+            throw new ExitTrappedException();
+        }
+
+        @Override
+        public void checkPermission(Permission perm) {
+        }
+
+        @Override
+        public void checkPermission(Permission perm, Object context) {
+        }
+    }
+
+    @SuppressWarnings("removal")
+    public static void main(String[] args) throws IOException {
+        PrintStream out = System.out;
+        PrintStream console = System.err;
+        ByteArrayOutputStream capture = new ByteArrayOutputStream();
+        PrintStream capturePrintStream = new PrintStream(capture, true, StandardCharsets.UTF_8);
+
+        ExitTrap trap = new ExitTrap();
+        System.setSecurityManager(trap);
+        System.setOut(console);
+
+        BufferedReader in;
+        if (args.length == 2 && args[0].equals("--batch")) {
+            in = new BufferedReader(new InputStreamReader(new FileInputStream(args[1]), StandardCharsets.UTF_8));
+        } else {
+            in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        }
+
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] fields = line.split("\t", 3);
+            String caseId = fields[0];
+            String mapPath = fields.length > 1 ? fields[1] : "";
+            String actions = fields.length > 2 ? fields[2] : "";
+
+            capture.reset();
+            System.setOut(capturePrintStream);
+            System.setErr(capturePrintStream);
+
+            Integer returnCode = runCase(trap, mapPath, actions, capturePrintStream);
+
+            System.setOut(console);
+            System.setErr(console);
+
+            String status = returnCode != null ? returnCode.toString() : "timeout";
+            byte[] output = capture.toByteArray();
+            out.print("RC=" + status + " " + output.length + " " + caseId + "\n");
+            out.write(output);
+            out.flush();
+
+            if (trap.status == null) {
+                // JPacman didn't exit, so its timers are still running and would leak into the next case.
+                break;
+            }
+        }
+
+        // Lingering JPacman threads (e.g. AWT) would otherwise keep the JVM alive.
+        System.setSecurityManager(null);
+        System.exit(0);
+    }
+
+    /**
+     * Runs a single JPacman case, mimicking the exit code a fresh JVM would have returned.
+     * Returns null if JPacman returned without exiting, where a fresh JVM would have hung.
+     */
+    private static Integer runCase(ExitTrap trap, String mapPath, String actions, PrintStream err) {
+        trap.status = null;
+
+        Integer returnCode = null;
+        try {
+            Pacman.main(new String[]{mapPath, actions});
+        } catch (ExitTrappedException e) {
+            // Status recorded by the trap.
+        } catch (Throwable t) {
+            err.print("Exception in thread \"main\" ");
+            t.printStackTrace(err);
+            returnCode = 1;
+        }
+
+        for (Window window : Window.getWindows()) {
+            window.dispose();
+        }
+
+        return trap.status != null ? trap.status : returnCode;
+    }
+}
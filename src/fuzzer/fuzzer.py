@@ -1,16 +1,107 @@
+import asyncio
 import json
 import logging
+import math
 import os
+import shutil
 import subprocess
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache
+from hashlib import blake2b
 from logging import Logger
+from queue import Queue, Full
 from random import Random
-from threading import Thread
-from time import time, sleep
-from typing import Callable
+from threading import Event, Thread
+from time import monotonic
+from typing import Callable, Iterator
 
 from .enums import Action, MapItem
+from .jpacman_worker import JPacmanWorker, LAUNCHER_ERROR
 from .map_string_generator import map_string_generators
 
+# subprocess only uses the (cheaper) posix_spawn path for executables given with a directory.
+_JAVA_PATH = shutil.which("java") or "java"
+
+_ACTION_VALUES = tuple(action.value for action in Action)
+
+# Byte values of the map items and actions, used to mutate inputs in place.
+_MAP_ITEM_BYTES = tuple((map_item, ord(map_item.value)) for map_item in MapItem)
+_ACTION_BYTES = tuple((action, ord(action.value)) for action in Action)
+_NEWLINE_BYTE = ord("\n")
+
+
+def _run_jpacman_process(jpacman_argv: list, timeout: float | None) -> (int | str, str):
+    """
+    Runs JPacman in a new JVM.
+    :param jpacman_argv: Full JPacman command, as an argument list.
+    :param timeout: Timeout in seconds.
+    :return: Exit code (or "timeout") and output of JPacman.
+    """
+    # The fuzzer's own file descriptors are non-inheritable, so they don't need closing in the child. Not closing them
+    # allows subprocess to use posix_spawn instead of fork + exec.
+    with subprocess.Popen(jpacman_argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          close_fds=False) as jpacman_process:
+        try:
+            stdout, stderr = jpacman_process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            jpacman_process.kill()
+            jpacman_process.communicate()
+            return "timeout", ""
+
+    # Output is read as bytes and decoded once, so invalid UTF-8 from the JVM can't break the run.
+    return jpacman_process.returncode, (stdout + stderr).decode(errors="replace")
+
+
+async def _run_jpacman_process_async(jpacman_argv: list, timeout: float | None) -> (int | str, str):
+    """
+    Runs JPacman in a new JVM, without blocking the event loop.
+    :param jpacman_argv: Full JPacman command, as an argument list.
+    :param timeout: Timeout in seconds.
+    :return: Exit code (or "timeout") and output of JPacman.
+    """
+    jpacman_process = await asyncio.create_subprocess_exec(*jpacman_argv, stdout=asyncio.subprocess.PIPE,
+                                                           stderr=asyncio.subprocess.PIPE, close_fds=False)
+    try:
+        stdout, stderr = await asyncio.wait_for(jpacman_process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        jpacman_process.kill()
+        await jpacman_process.communicate()
+        return "timeout", ""
+
+    return jpacman_process.returncode, (stdout + stderr).decode(errors="replace")
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that leaves records in the file buffer instead of flushing after every record.
+    Records at or above the flush level are flushed straight away, the rest is written once the buffer fills up, the
+    handler is flushed or the handler is closed.
+    """
+
+    def __init__(self, filename: str, mode: str = "a", flush_level: int = logging.WARNING) -> None:
+        """
+        Initializes the handler.
+        :param filename: Path to the log file.
+        :param mode: Mode to open the log file with.
+        :param flush_level: Minimum level of records that are flushed immediately.
+        """
+        super().__init__(filename, mode=mode)
+        self.flush_level = flush_level
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Records after the handler was closed are dropped, like FileHandler does for files opened with "w".
+        if self.stream is None:
+            return
+
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
 
 class Fuzzer:
     """
@@ -37,18 +128,33 @@ class Fuzzer:
         self.random: Random = random
         self.verbose: bool = False
 
-        self.history: list = []
-        self.mutation_history: list = []  # Hashes of mutated maps + action sequences
+        # The history is streamed to a JSONL file (one [iteration, exit code, map, actions, output, note] list per
+        # line), only the statistics for the report are kept in memory.
+        self._history_path: str | None = None
+        self._history_sink = None
+        self._exit_codes: Counter = Counter()
+        self._errors: Counter = Counter()  # Outputs of runs with a non-zero exit code
+        self.mutation_history: set = set()  # Digests of mutated maps + action sequences
+        # Hashes of executed maps + action sequences -> (iteration, exit code, output), least recently used first
+        self._seen: OrderedDict = OrderedDict()
+        self.dedup_hits: int = 0
 
         self.iteration: int = 0
-        self.start_time: float = time()
-        self.last_partial_report: float = time()
+        self._tick: Event = Event()  # Set whenever an iteration finishes, wakes up the progress bar
+        self.start_time: float = monotonic()
+        self.last_partial_report: float = monotonic()
         self.max_iterations: int = max_iterations or -1
         self.max_time: int = max_time or -1
+        self._deadline: float = self.start_time + self.max_time if self.max_time >= 0 else math.inf
 
         if not self.logger:
             self.__init_logger()
 
+        # Child logger for the (per iteration) verbose messages. These use lazy formatting, so they cost next to
+        # nothing when verbose is off.
+        self.verbose_logger: Logger = self.logger.getChild("verbose")
+        self.verbose_logger.setLevel(logging.DEBUG if self.verbose else logging.INFO)
+
         if not self.random:
             self.__init_random()
 
@@ -56,6 +162,29 @@ class Fuzzer:
                                                                                              self.config,
                                                                                              self.logger)
 
+        self._input_path: str = os.path.join(self.__prepare_output_path(), "input.map")
+        self._input_fd: int | None = None  # Kept open, input.map is rewritten in place every iteration
+
+        self._history_path = os.path.join(self.config.get("output_path"), "history.jsonl")
+        self._history_sink = open(self._history_path, "w")
+
+        self.__resolve_jpacman_path()
+        self._jpacman_argv_prefix: list = [_JAVA_PATH, "-jar", self.config.get("jpacman_path"), self._input_path]
+
+        # Config values read every iteration, looked up once here.
+        self._jpacman_timeout: float | None = self.config.get("jpacman_timeout")
+        self._max_action_sequence_length: int = self.config.get("max_action_sequence_length")
+        self._end_with_exit: bool = self.config.get("map_gen_format") >= 3
+        self._memoize_size: int = self.config.get("memoize_size") or 0
+
+        self._jvm: JPacmanWorker | None = None
+        self.__init_jvm()
+
+        self._batch_queue: deque = deque()  # Inputs of batch cases that didn't get to run, run in the next batch
+        self._map_pool: Queue | None = None  # Maps generated in the background during random runs
+        self._default_map_string_generator: Callable = self.map_string_generator  # Pool is skipped if replaced
+        self._map_pool_stop: Event = Event()
+
         self.logger.debug("Fuzzer initialised.")
 
     def __init_logger(self) -> None:
@@ -65,29 +194,26 @@ class Fuzzer:
         self.logger = logging.getLogger("Fuzzer")
         self.logger.setLevel(logging.DEBUG)
 
+        self.verbose = self.config.get("verbose") or False
+
+        # Debug messages always go to the log file, but only reach the console in verbose mode.
         stream_handler = logging.StreamHandler()
-        stream_handler.setLevel(logging.DEBUG)
+        stream_handler.setLevel(logging.DEBUG if self.verbose else logging.INFO)
         stream_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
         self.logger.addHandler(stream_handler)
 
         log_path = self.config.get("log_path")
-        if not os.path.exists(os.path.dirname(log_path)):
-            try:
-                os.makedirs(os.path.dirname(log_path))
-                self.__verbose_log(f"Log directory created: {os.path.dirname(log_path)}")
-            except OSError as e:
-                self.logger.error("Could not create log directory: {}".format(e))
-                raise e
-
-        open(f"{log_path}/fuzzer.log", "w").write("")
+        try:
+            os.makedirs(log_path, exist_ok=True)
+        except OSError as e:
+            self.logger.error("Could not create log directory: {}".format(e))
+            raise e
 
-        file_handler = logging.FileHandler(f"{log_path}/fuzzer.log")
+        file_handler = _BufferedFileHandler(f"{log_path}/fuzzer.log", mode="w")
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
         self.logger.addHandler(file_handler)
 
-        self.verbose = self.config.get("verbose") or False
-
         self.logger.debug("Logger initialised.")
 
     def __init_random(self) -> None:
@@ -98,32 +224,92 @@ class Fuzzer:
 
         self.logger.debug(f"Random object initialised.")
 
-    def __verbose_log(self, message: str) -> None:
+    def __init_jvm(self) -> None:
         """
-        Logs a message if verbose is True.
-        :param message: Message to log.
+        Initializes the long-lived JPacman worker, if the launcher jar is available.
         """
-        if self.verbose:
-            self.logger.debug(message)
+        launcher_path = self.config.get("jpacman_launcher_path")
+
+        if not JPacmanWorker.available(launcher_path):
+            self.logger.debug("JPacman launcher not available, starting a new JVM per iteration.")
+            return
+
+        self._jvm = JPacmanWorker(launcher_path, self._jpacman_timeout, self.logger, java_path=_JAVA_PATH)
+
+        self.logger.debug("JPacman worker initialised.")
+
+    def __drop_jvm(self) -> None:
+        """
+        Stops using the JPacman launcher after it failed without ever answering a case, starting a new JVM per
+        iteration from then on.
+        """
+        self.logger.warning("JPacman launcher is not working, falling back to a new JVM per iteration.")
+        self._jvm.close()
+        self._jvm = None
+
+    def close(self) -> None:
+        """
+        Stops the JPacman worker, if any, and closes the input & history files. These are reopened if JPacman is run
+        again.
+        """
+        if self._jvm:
+            self._jvm.close()
+
+        if self._input_fd is not None:
+            os.close(self._input_fd)
+            self._input_fd = None
+
+        if self._history_sink is not None:
+            self._history_sink.close()
+            self._history_sink = None
+
+        if self._map_pool is not None:
+            self._map_pool_stop.set()
+            self._map_pool = None
 
     def runtime(self) -> float:
         """
         Calculates the runtime of the fuzzer.
         :return: Runtime in seconds.
         """
-        return time() - self.start_time
+        return monotonic() - self.start_time
 
     def limit_reached(self) -> bool:
         """
         Checks if the fuzzer has reached its limit, based on the maximum iterations and maximum time.
         :return: True if the fuzzer has reached its limit, False otherwise.
         """
-        return (0 <= self.max_iterations <= self.iteration) or (0 <= self.max_time <= self.runtime())
+        return (0 <= self.max_iterations <= self.iteration) or monotonic() >= self._deadline
 
-    def generate_input(self, map_string: str) -> None:
+    def generate_input(self, map_string: str, name: str = "input.map") -> str:
         """
-        Generates a map input file and outputs it into the output directory under the name input.map.
-        :param map_string: Map string to use. If None, a new map string will be generated.
+        Writes a map input file into the output directory.
+        :param map_string: Map string to write.
+        :param name: Name of the input file, input.map is rewritten in place.
+        :return: Path to the input file.
+        """
+        if name == "input.map":
+            if self._input_fd is None:
+                self._input_fd = os.open(self._input_path, os.O_WRONLY | os.O_CREAT, 0o644)
+
+            map_bytes = map_string.encode()
+            os.pwrite(self._input_fd, map_bytes, 0)
+            os.ftruncate(self._input_fd, len(map_bytes))
+
+            input_path = self._input_path
+        else:
+            input_path = os.path.join(self.config.get("output_path"), name)
+            with open(input_path, "w") as input_file:
+                input_file.write(map_string)
+
+        self.verbose_logger.debug("Input file generated: %s", input_path)
+
+        return input_path
+
+    def __prepare_output_path(self) -> str:
+        """
+        Ensures the output directory exists, falling back to the default output path if none is configured.
+        :return: Output path.
         """
         output_path = self.config.get("output_path")
 
@@ -132,46 +318,96 @@ class Fuzzer:
             output_path = "./data/output"
             self.config["output_path"] = output_path
 
-        if not os.path.exists(output_path):
+        try:
+            os.makedirs(output_path, exist_ok=True)
+        except OSError as e:
+            self.logger.error("Could not create output directory: {}".format(e))
+            raise e
+
+        return output_path
+
+    def __start_map_pool(self) -> None:
+        """
+        Starts generating maps in a background thread, so they are ready by the time JPacman finishes the previous run.
+        The pool uses its own map string generator & random object (seeded from the fuzzer's), so runs stay
+        reproducible for a given seed. If map_string_generator was replaced, it is used directly instead of the pool.
+        """
+        map_pool_size = self.config.get("map_pool_size") or 0
+        if map_pool_size <= 0 or self._map_pool is not None:
+            return
+
+        if self.map_string_generator is not self._default_map_string_generator:
+            self.logger.debug("Map string generator was replaced, not using the map pool.")
+            return
+
+        map_string_generator = map_string_generators[self.config.get("map_gen_format")](
+            Random(self.random.getrandbits(64)), self.config, self.logger)
+
+        self._map_pool = Queue(maxsize=map_pool_size)
+        self._map_pool_stop = Event()
+
+        Thread(target=self.__fill_map_pool, args=(self._map_pool, self._map_pool_stop, map_string_generator),
+               daemon=True).start()
+
+    @staticmethod
+    def __fill_map_pool(map_pool: Queue, stop: Event, map_string_generator: Callable) -> None:
+        """
+        Keeps the map pool filled until stopped.
+        If the map string generator raises an exception, it is put into the queue instead and the pool stops.
+        :param map_pool: Queue to fill.
+        :param stop: Event to stop filling the queue.
+        :param map_string_generator: Map string generator to use.
+        """
+        while not stop.is_set():
             try:
-                os.makedirs(output_path)
-                self.__verbose_log(f"Output directory created: {output_path}")
-            except OSError as e:
-                self.logger.error("Could not create output directory: {}".format(e))
-                raise e
+                map_string = map_string_generator()
+            except Exception as e:
+                map_string = e
 
-        input_file = open(os.path.join(output_path, "input.map"), "w")
-        input_file.write(map_string)
+            while not stop.is_set():
+                try:
+                    map_pool.put(map_string, timeout=0.25)
+                    break
+                except Full:
+                    continue
 
-        self.__verbose_log(f"Input file generated: {input_file.name}")
+            if isinstance(map_string, Exception):
+                return
+
+    def __next_map_string(self) -> str:
+        """
+        Gets the next random map string, from the map pool if it is running.
+        :return: Map string.
+        :raises Exception: Whatever the map pool's map string generator raised.
+        """
+        if self._map_pool is not None:
+            map_string = self._map_pool.get()
+            if isinstance(map_string, Exception):
+                # The pool stopped at the failed map, the exception is raised here where the map was needed.
+                self._map_pool = None
+                raise map_string
+            return map_string
+
+        return self.map_string_generator()
 
     def generate_action_sequence(self) -> str:
         """
         Generates an action sequence.
         :return: Action sequence in a JPacman compatible format.
         """
-        action_sequence = ""
-        max_action_sequence_length = self.config.get("max_action_sequence_length")
-
-        actual_action_sequence_length = self.random.randint(1, max_action_sequence_length)
+        actual_action_sequence_length = self.random.randint(1, self._max_action_sequence_length)
 
-        for i in range(actual_action_sequence_length):
-            action_sequence += self.__random_action().value
+        actions = self.random.choices(_ACTION_VALUES, k=actual_action_sequence_length)
 
         # Ensure action sequence ends with exit to prevent JPacman from hanging
-        if self.config.get("map_gen_format") >= 3:
-            action_sequence = action_sequence[:-1] + "E"
+        if self._end_with_exit:
+            actions[-1] = Action.EXIT.value
 
-        self.__verbose_log(f"Action sequence generated: {action_sequence}")
+        action_sequence = "".join(actions)
 
-        return action_sequence
+        self.verbose_logger.debug("Action sequence generated: %s", action_sequence)
 
-    def __random_action(self) -> Action:
-        """
-        Generates a random action.
-        :return: Random action.
-        """
-        return self.random.choice(list(Action))
+        return action_sequence
 
     def run_jpacman(self, map_string: str = None, action_sequence: str = None, note: str = None) -> int:
         """
@@ -182,47 +418,254 @@ class Fuzzer:
         :return: Exit code of JPacman.
         """
         if map_string is None:
-            map_string = self.map_string_generator()
+            map_string = self.__next_map_string()
 
         if action_sequence is None:
             action_sequence = self.generate_action_sequence()
 
-        self.generate_input(map_string)
+        duplicate_return_code = self.__add_duplicate_history(map_string, action_sequence, note)
+        if duplicate_return_code is not None:
+            return duplicate_return_code
 
-        jpacman_path = self.config.get("jpacman_path")
-        if not jpacman_path:
-            self.logger.warning("No JPacman path specified, using default JPacman path")
-            jpacman_path = "./jpacman/jpacman-3.0.1.jar"
-            self.config["jpacman_path"] = jpacman_path
+        input_path = self.generate_input(map_string)
 
-        jpacman_command = f"java -jar {jpacman_path} {self.config.get('output_path')}/input.map {action_sequence}"
+        if self._jvm:
+            return_code, process_output = self._jvm.run(input_path, action_sequence)
+            if return_code == LAUNCHER_ERROR and not self._jvm.answered:
+                self.__drop_jvm()
+                return_code, process_output = self.__run_jpacman_process(action_sequence)
+        else:
+            return_code, process_output = self.__run_jpacman_process(action_sequence)
 
-        self.__verbose_log(f"JPacman command: {jpacman_command}")
+        self.__add_history(return_code, map_string, action_sequence, process_output, note)
 
-        try:
-            jpacman_process = subprocess.run(jpacman_command, timeout=self.config.get("jpacman_timeout"), text=True,
-                                             capture_output=True)
-            return_code = jpacman_process.returncode
-            process_output = jpacman_process.stdout + jpacman_process.stderr
-        except subprocess.TimeoutExpired:
+        return return_code
+
+    def __add_history(self, return_code: int | str, map_string: str, action_sequence: str, process_output: str,
+                      note: str = None) -> None:
+        """
+        Adds a finished JPacman run to the history, as the next iteration.
+        :param return_code: Exit code (or "timeout") of JPacman.
+        :param map_string: Map string that was used.
+        :param action_sequence: Action sequence that was used.
+        :param process_output: Output of JPacman.
+        :param note: Note to add to the history entry.
+        """
+        self.verbose_logger.debug("JPacman exit code: %s", return_code)
+
+        if return_code == "timeout":
             self.logger.warning("JPacman timed out")
-            return_code = "timeout"
-            process_output = ""
 
-        self.__verbose_log(f"JPacman exit code: {return_code}")
+        self.__append_history(return_code, map_string, action_sequence, process_output, note)
 
-        self.iteration += 1
+        # A launcher failure says nothing about the input, and a timeout may have been a slow run rather than a hang,
+        # so neither is reused for duplicates.
+        if self._memoize_size > 0 and return_code not in ("timeout", LAUNCHER_ERROR):
+            self._seen[hash((map_string, action_sequence))] = (self.iteration, return_code, process_output)
+            if len(self._seen) > self._memoize_size:
+                self._seen.popitem(last=False)
+
+    def __add_duplicate_history(self, map_string: str, action_sequence: str, note: str = None) -> int | str | None:
+        """
+        Adds the result of a previous run to the history if the inputs were already run, instead of running JPacman.
+        :param map_string: Map string to use.
+        :param action_sequence: Action sequence to use.
+        :param note: Note to add to the history entry.
+        :return: Exit code of the previous run if the inputs were already run, None otherwise.
+        """
+        if self._memoize_size <= 0:
+            return None
 
-        self.history.append([self.iteration, return_code, map_string, action_sequence, process_output, note])
+        input_hash = hash((map_string, action_sequence))
+        seen = self._seen.get(input_hash)
+        if seen is None:
+            return None
+
+        self._seen.move_to_end(input_hash)
+
+        previous_iteration, return_code, process_output = seen
+        self.dedup_hits += 1
+
+        self.verbose_logger.debug("Duplicate input, reusing result of iteration %s", previous_iteration)
+
+        duplicate_note = f"Duplicate of iteration {previous_iteration}, JPacman was not run."
+        note = f"{note.rstrip()}\n{duplicate_note}" if note else duplicate_note
+        self.__append_history(return_code, map_string, action_sequence, process_output, note)
 
         return return_code
 
+    def __append_history(self, return_code: int | str, map_string: str, action_sequence: str, process_output: str,
+                         note: str | None) -> None:
+        """
+        Writes the next iteration to the history file and updates the statistics.
+        :param return_code: Exit code (or "timeout") of JPacman.
+        :param map_string: Map string that was used.
+        :param action_sequence: Action sequence that was used.
+        :param process_output: Output of JPacman.
+        :param note: Note to add to the history entry.
+        """
+        if self._history_sink is None:
+            self._history_sink = open(self._history_path, "a")
+
+        self.iteration += 1
+
+        self._history_sink.write(
+            json.dumps([self.iteration, return_code, map_string, action_sequence, process_output, note]) + "\n")
+
+        self._exit_codes[return_code] += 1
+        if return_code != 0:
+            self._errors[process_output] += 1
+
+        self._tick.set()
+
+    def iter_history(self) -> Iterator[list]:
+        """
+        Reads the history back from the history file.
+        :return: Generator of [iteration, exit code, map string, action sequence, output, note] lists.
+        """
+        if self._history_sink is not None:
+            self._history_sink.flush()
+
+        with open(self._history_path) as history_file:
+            for line in history_file:
+                yield json.loads(line)
+
+    def run_jpacman_batch(self, batch_size: int) -> list:
+        """
+        Runs JPacman with a batch of generated inputs, using a single JVM for the whole batch.
+        Requires the JPacman launcher to be available.
+        :param batch_size: Number of inputs in the batch.
+        :return: Exit codes of JPacman.
+        """
+        cases = []
+        for i in range(batch_size):
+            if self._batch_queue:
+                map_string, action_sequence = self._batch_queue.popleft()
+            else:
+                map_string = self.__next_map_string()
+                action_sequence = self.generate_action_sequence()
+            if self.__add_duplicate_history(map_string, action_sequence) is not None:
+                continue
+            input_path = self.generate_input(map_string, name=f"input_{i}.map")
+            cases.append((input_path, map_string, action_sequence))
+
+        if not cases:
+            return []
+
+        results = self._jvm.run_batch(os.path.join(self.config.get("output_path"), "batch.txt"),
+                                      [(input_path, action_sequence) for input_path, _, action_sequence in cases])
+
+        if results[0] == (LAUNCHER_ERROR, "") and not self._jvm.answered:
+            self.__drop_jvm()
+            return [self.run_jpacman(map_string, action_sequence) for _, map_string, action_sequence in cases]
+
+        return_codes = []
+        for (_, map_string, action_sequence), result in zip(cases, results):
+            if result is None:
+                # Never ran because the batch was cut short, it goes into the next batch instead.
+                self._batch_queue.append((map_string, action_sequence))
+                continue
+            return_code, process_output = result
+            self.__add_history(return_code, map_string, action_sequence, process_output)
+            return_codes.append(return_code)
+
+        return return_codes
+
+    def __resolve_jpacman_path(self) -> None:
+        """
+        Falls back to the default JPacman path if none is configured.
+        """
+        if not self.config.get("jpacman_path"):
+            self.logger.warning("No JPacman path specified, using default JPacman path")
+            self.config["jpacman_path"] = "./jpacman/jpacman-3.0.1.jar"
+
+    def __run_jpacman_process(self, action_sequence: str) -> (int | str, str):
+        """
+        Runs JPacman in a new JVM on input.map.
+        :param action_sequence: Action sequence to use.
+        :return: Exit code (or "timeout") and output of JPacman.
+        """
+        jpacman_argv = self._jpacman_argv_prefix + [action_sequence]
+
+        self.verbose_logger.debug("JPacman command: %s", jpacman_argv)
+
+        return _run_jpacman_process(jpacman_argv, self._jpacman_timeout)
+
+    def __run_parallel(self, workers: int, partial_reports: bool, partial_report_interval: int) -> None:
+        """
+        Runs randomly generated inputs on multiple concurrent JVMs, until the limit is reached.
+        Inputs are generated here, so the run stays reproducible for a given seed (apart from the history order).
+        :param workers: Number of concurrent JVMs.
+        :param partial_reports: Whether to generate partial reports every partial_report_interval seconds.
+        :param partial_report_interval: Interval in seconds between partial reports.
+        """
+        asyncio.run(self.__run_parallel_async(workers, partial_reports, partial_report_interval))
+
+    async def __run_parallel_async(self, workers: int, partial_reports: bool, partial_report_interval: int) -> None:
+        """
+        Event loop side of __run_parallel.
+        :param workers: Number of concurrent JVMs.
+        :param partial_reports: Whether to generate partial reports every partial_report_interval seconds.
+        :param partial_report_interval: Interval in seconds between partial reports.
+        """
+        # Every JVM slot gets its own input file, so concurrent runs don't overwrite each other's input.
+        input_paths = []
+        for worker in range(workers):
+            worker_path = os.path.join(self.config.get("output_path"), f"worker_{worker}")
+            os.makedirs(worker_path, exist_ok=True)
+            input_paths.append(os.path.join(worker_path, "input.map"))
+        argv_prefixes = [self._jpacman_argv_prefix[:-1] + [input_path] for input_path in input_paths]
+
+        free_workers = list(range(workers))
+        pending = {}
+
+        def can_submit() -> bool:
+            """
+            Checks if another run can be started without overshooting the limit.
+            :return: True if another run can be started, False otherwise.
+            """
+            return not (0 <= self.max_iterations <= self.iteration + len(pending)) and monotonic() < self._deadline
+
+        while True:
+            while free_workers and can_submit():
+                map_string = self.__next_map_string()
+                action_sequence = self.generate_action_sequence()
+                if self.__add_duplicate_history(map_string, action_sequence) is not None:
+                    continue
+
+                worker = free_workers.pop()
+                with open(input_paths[worker], "w") as input_file:
+                    input_file.write(map_string)
+
+                jpacman_argv = argv_prefixes[worker] + [action_sequence]
+                task = asyncio.create_task(_run_jpacman_process_async(jpacman_argv, self._jpacman_timeout))
+                pending[task] = (worker, map_string, action_sequence)
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                worker, map_string, action_sequence = pending.pop(task)
+                free_workers.append(worker)
+                return_code, process_output = task.result()
+                self.__add_history(return_code, map_string, action_sequence, process_output)
+
+            if partial_reports:
+                self.__write_partial_report(partial_report_interval=partial_report_interval)
+
     def __prep_run(self, clear_history: bool) -> None:
         if clear_history:
-            self.history.clear()
+            if self._history_sink is not None:
+                self._history_sink.close()
+            self._history_sink = open(self._history_path, "w")
+            self._exit_codes.clear()
+            self._errors.clear()
 
-        self.start_time = time()
-        self.last_progress_report = time()
+        self.start_time = monotonic()
+        self.last_progress_report = self.start_time
+        # The time limit is checked every iteration, so it is turned into an absolute deadline once.
+        self._deadline = self.start_time + self.max_time if self.max_time >= 0 else math.inf
 
         if self.max_time <= 0 and self.max_iterations <= 0:
             self.logger.warning("No limit specified, the fuzzer will run indefinitely!")
@@ -230,6 +673,8 @@ class Fuzzer:
     def __finish_run(self, generate_report: bool) -> None:
         runtime = self.runtime()
 
+        self.close()
+
         self.logger.info(
             f"Fuzzer finished after {runtime}(/{self.max_time}) seconds | {self.iteration}(/{self.max_iterations}) iterations")
 
@@ -304,8 +749,9 @@ class Fuzzer:
         Writes a partial report.
         :param partial_report_interval: Interval in seconds between partial reports.
         """
-        if time() - self.last_partial_report >= partial_report_interval:
-            self.last_partial_report = time()
+        now = monotonic()
+        if now - self.last_partial_report >= partial_report_interval:
+            self.last_partial_report = now
             self.generate_report(partial=True)
 
     def __print_progress_bar_wrap(self, progress_func: Callable, suffix_func: Callable = None) -> None:
@@ -314,11 +760,11 @@ class Fuzzer:
         :param progress_func: Function to call to get the progress.
         :param suffix_func: Function to call to get the suffix. Defaults to __get_progress_string.
         """
-        sleep(0.01)
-
         while not self.limit_reached():
+            # Only repaint once an iteration finished, or periodically for time-based progress.
+            self._tick.wait(timeout=0.25)
+            self._tick.clear()
             self.__print_progress_bar(suffix=(suffix_func or self.__get_progress_string)(), progress=progress_func())
-            sleep(0.01)
 
         self.__print_progress_bar(suffix=self.__get_progress_string(), progress=1, finished=True)
 
@@ -337,13 +783,34 @@ class Fuzzer:
             return self.__get_progress()[0]
 
         self.__prep_run(clear_history=clear_history)
+        self.__start_map_pool()
 
         if progress_bar:
             progress_bar_thread = Thread(target=self.__print_progress_bar_wrap, args=(progress_func,))
             progress_bar_thread.start()
 
+        workers = self.config.get("workers")
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if (workers or 1) > 1:
+            if self._jvm or (self.config.get("batch_size") or 1) > 1:
+                self.logger.warning(f"Running {workers} workers, every iteration starts a new JVM. The JPacman "
+                                    f"launcher and batch_size are not used with more than 1 worker.")
+            self.__run_parallel(workers, partial_reports=partial_reports,
+                                partial_report_interval=partial_report_interval)
+
+        batch_size = self.config.get("batch_size") or 1
+        if batch_size > 1 and not self._jvm:
+            self.logger.warning("Batch size ignored, the JPacman launcher is not available")
+
         while not self.limit_reached():
-            self.run_jpacman()
+            if batch_size > 1 and self._jvm:
+                if self.max_iterations > 0:
+                    self.run_jpacman_batch(min(batch_size, self.max_iterations - self.iteration))
+                else:
+                    self.run_jpacman_batch(batch_size)
+            else:
+                self.run_jpacman()
             if partial_reports:
                 self.__write_partial_report(partial_report_interval=partial_report_interval)
 
@@ -362,16 +829,23 @@ class Fuzzer:
         :param partial_reports: Whether to generate partial reports every partial_report_interval seconds.
         :param progress_bar: Whether to print a progress bar.
         :param max_depth: Maximum depth of the mutation tree.
+        :raises ValueError: If the input map or action sequence contains non-ASCII characters.
         """
+        if not initial_map_string.isascii() or not initial_action_sequence.isascii():
+            self.logger.error("Mutation runs require ASCII input maps and action sequences")
+            raise ValueError("Mutation runs require ASCII input maps and action sequences")
 
-        def hash_inputs(new_map_string: str, new_action_sequence: str) -> int:
+        def hash_inputs(new_map_bytes: bytes | bytearray, new_action_bytes: bytes | bytearray) -> bytes:
             """
-            Hashes the input map and action sequence.
-            :return: Hash of the input map and action sequence.
+            Hashes the (encoded) input map and action sequence.
+            Unlike hash(), the digest is stable across processes and doesn't require concatenating the inputs.
+            :return: 8 byte digest of the input map and action sequence.
             """
-            return hash(new_map_string + new_action_sequence)
+            digest = blake2b(new_map_bytes, digest_size=8)
+            digest.update(new_action_bytes)
+            return digest.digest()
 
-        def previously_mutated(some_hash_value: int) -> bool:
+        def previously_mutated(some_hash_value: bytes) -> bool:
             """
             Checks if the input map and action sequence have been previously mutated.
             :return: Whether the input map and action sequence have been previously mutated.
@@ -398,85 +872,154 @@ class Fuzzer:
             """
             return f" -- Mutations: {len(self.mutation_history)}/{possible_mutations}" + self.__get_progress_string()
 
-        def mutate(map_string: str, action_sequence: str, mutate_action: bool = False, depth: int = 0,
-                   previous_iteration: int = None) -> None:
+        def run_mutation(new_map_string: str, new_action_sequence: str, note: str) -> bool:
+            """
+            Runs JPacman on a mutation, unless the limit has been reached.
+            :param new_map_string: Mutated map string.
+            :param new_action_sequence: Mutated action sequence.
+            :param note: Note to add to the history entry.
+            :return: Whether JPacman was run.
             """
-            Mutates the input map and action sequence and runs JPacman -- recursively.
+            if self.limit_reached():
+                return False
+
+            self.run_jpacman(map_string=new_map_string, action_sequence=new_action_sequence, note=note)
+            if partial_reports:
+                self.__write_partial_report(partial_report_interval=partial_report_interval)
+            return True
+
+        def reject(map_buffer: bytes | bytearray, action_buffer: bytes | bytearray, hash_value: bytes) -> None:
+            """
+            Logs a rejected duplicate mutation.
+            :param map_buffer: Mutated map.
+            :param action_buffer: Mutated action sequence.
+            :param hash_value: Digest of the mutated map and action sequence.
+            """
+            if self.verbose_logger.isEnabledFor(logging.DEBUG):
+                self.verbose_logger.debug(
+                    "Rejected duplicate mutation:\nMap:\n%s\nAction Sequence:\n%s\n\nHash: %s\n",
+                    map_buffer.decode(), action_buffer.decode(), hash_value.hex())
+
+        def mutate_map(map_string: str, action_sequence: str, depth: int,
+                       previous_iteration: int | None) -> Iterator[tuple]:
+            """
+            Mutates every (non-newline) item of the input map and runs JPacman.
+            Instead of recursing, the arguments for the next (deeper) mutate call are yielded. The caller runs that
+            call to completion before resuming this one, which keeps the depth-first order without deep recursion.
             :param map_string: Input map string.
             :param action_sequence: Action sequence string.
-            :param mutate_action: Whether to mutate the action sequence if true, or the map if false.
-            :param depth: Current depth of the recursion.
+            :param depth: Current depth of the mutation tree.
             :param previous_iteration: Previous iteration. Used for the note.
+            :return: Generator of arguments for the next mutate calls.
             """
-            nonlocal max_depth
-
-            new_map_string = map_string[:]
-            new_action_sequence = action_sequence[:]
+            # Mutations are done in place on this buffer, strings are only built for actual runs.
+            map_buffer = bytearray(map_string, "ascii")
+            action_bytes = action_sequence.encode("ascii")
 
             previous_iteration = previous_iteration or self.iteration
             note = f"New mutation call from iteration {previous_iteration}. Currently at depth {depth}.\n"
 
             rejected = 0
 
-            for i in range(len(map_string)):
-                if map_string[i] == "\n":
+            for i in range(len(map_buffer)):
+                original_map_byte = map_buffer[i]
+                if original_map_byte == _NEWLINE_BYTE:
                     continue
-                for j in range(len(action_sequence)):
-                    for map_item in MapItem:
-                        if not mutate_action:
-                            note += f"From iteration {previous_iteration}: Mutated {map_string[i]} at index {i} to {map_item.value} ({map_item})."
-                            new_map_string = map_string[:i] + map_item.value + map_string[i + 1:]
-                        for action in Action:
-                            if mutate_action:
-                                note += f"From iteration {previous_iteration}: Mutated {action_sequence[j]} at index {j} to {action.value} ({action})."
-                                new_action_sequence = new_action_sequence[:j] + action.value + new_action_sequence[
-                                                                                               j + 1:]
-
-                            hash_value = hash_inputs(new_map_string, new_action_sequence)
-
-                            if previously_mutated(hash_value):
-                                self.__verbose_log(
-                                    f"Rejected duplicate mutation:\nMap:\n{new_map_string}\nAction Sequence:\n{new_action_sequence}\n\nHash: {hash_value}\n")
-                                note = ""
-                                rejected += 1
-                                if not mutate_action:
-                                    # No need to mutate the action sequence if we're mutating the map.
-                                    break
-                                continue
-
-                            if rejected > 0:
-                                note += f"\nRejected {rejected} duplicate previous mutations."
-                                rejected = 0
-
-                            self.mutation_history.append(hash_value)
-
-                            if not self.limit_reached():
-                                self.run_jpacman(map_string=new_map_string, action_sequence=new_action_sequence,
-                                                 note=note)
-                                if partial_reports:
-                                    self.__write_partial_report(partial_report_interval=partial_report_interval)
-                            else:
-                                return
-
-                            previous_iteration = self.iteration
-                            note = ""
-
-                            if depth < max_depth:
-                                mutate(new_map_string, new_action_sequence, mutate_action=not mutate_action,
-                                       depth=depth + 1, previous_iteration=previous_iteration)
-
-                            if not mutate_action:
-                                # No need to mutate the action sequence if we're mutating the map.
-                                break
-                        if mutate_action:
-                            # No need to mutate the map if we're mutating the action sequence.
-                            break
-                    if not mutate_action:
-                        # No need to iterate through the action sequence if we're mutating the map.
-                        break
-                if mutate_action:
-                    # No need to iterate through the map if we're mutating the action sequence.
-                    break
+                for map_item, map_item_byte in _MAP_ITEM_BYTES:
+                    note += f"From iteration {previous_iteration}: Mutated {map_string[i]} at index {i} to {map_item.value} ({map_item})."
+                    map_buffer[i] = map_item_byte
+
+                    hash_value = hash_inputs(map_buffer, action_bytes)
+
+                    if previously_mutated(hash_value):
+                        reject(map_buffer, action_bytes, hash_value)
+                        note = ""
+                        rejected += 1
+                        continue
+
+                    if rejected > 0:
+                        note += f"\nRejected {rejected} duplicate previous mutations."
+                        rejected = 0
+
+                    self.mutation_history.add(hash_value)
+
+                    new_map_string = map_buffer.decode()
+                    if not run_mutation(new_map_string, action_sequence, note):
+                        return
+
+                    previous_iteration = self.iteration
+                    note = ""
+
+                    if depth < max_depth:
+                        yield new_map_string, action_sequence, True, depth + 1, previous_iteration
+
+                # Map mutations are not cumulative, restore the original item.
+                map_buffer[i] = original_map_byte
+
+        def mutate_actions(map_string: str, action_sequence: str, depth: int,
+                           previous_iteration: int | None) -> Iterator[tuple]:
+            """
+            Mutates every action of the action sequence and runs JPacman.
+            Like mutate_map, the arguments for the next (deeper) mutate call are yielded instead of recursing.
+            :param map_string: Input map string.
+            :param action_sequence: Action sequence string.
+            :param depth: Current depth of the mutation tree.
+            :param previous_iteration: Previous iteration. Used for the note.
+            :return: Generator of arguments for the next mutate calls.
+            """
+            map_bytes = map_string.encode("ascii")
+            # Mutations are done in place on this buffer, strings are only built for actual runs.
+            action_buffer = bytearray(action_sequence, "ascii")
+
+            previous_iteration = previous_iteration or self.iteration
+            note = f"New mutation call from iteration {previous_iteration}. Currently at depth {depth}.\n"
+
+            rejected = 0
+
+            # Unlike map mutations, action mutations are cumulative: every position keeps the last action tried.
+            for j in range(len(action_buffer)):
+                for action, action_byte in _ACTION_BYTES:
+                    note += f"From iteration {previous_iteration}: Mutated {action_sequence[j]} at index {j} to {action.value} ({action})."
+                    action_buffer[j] = action_byte
+
+                    hash_value = hash_inputs(map_bytes, action_buffer)
+
+                    if previously_mutated(hash_value):
+                        reject(map_bytes, action_buffer, hash_value)
+                        note = ""
+                        rejected += 1
+                        continue
+
+                    if rejected > 0:
+                        note += f"\nRejected {rejected} duplicate previous mutations."
+                        rejected = 0
+
+                    self.mutation_history.add(hash_value)
+
+                    new_action_sequence = action_buffer.decode()
+                    if not run_mutation(map_string, new_action_sequence, note):
+                        return
+
+                    previous_iteration = self.iteration
+                    note = ""
+
+                    if depth < max_depth:
+                        yield map_string, new_action_sequence, False, depth + 1, previous_iteration
+
+        def mutate(map_string: str, action_sequence: str, mutate_action: bool = False, depth: int = 0,
+                   previous_iteration: int = None) -> Iterator[tuple]:
+            """
+            Mutates the input map or action sequence and runs JPacman.
+            :param map_string: Input map string.
+            :param action_sequence: Action sequence string.
+            :param mutate_action: Whether to mutate the action sequence if true, or the map if false.
+            :param depth: Current depth of the mutation tree.
+            :param previous_iteration: Previous iteration. Used for the note.
+            :return: Generator of arguments for the next mutate calls.
+            """
+            if mutate_action:
+                return mutate_actions(map_string, action_sequence, depth, previous_iteration)
+            return mutate_map(map_string, action_sequence, depth, previous_iteration)
 
         self.__prep_run(clear_history=clear_history)
 
@@ -488,9 +1031,16 @@ class Fuzzer:
 
         self.run_jpacman(map_string=initial_map_string, action_sequence=initial_action_sequence, note="Initial setup.")
 
-        self.mutation_history.append(hash_inputs(initial_map_string, initial_action_sequence))
+        self.mutation_history.add(hash_inputs(initial_map_string.encode("ascii"),
+                                              initial_action_sequence.encode("ascii")))
 
-        mutate(initial_map_string, initial_action_sequence)
+        mutation_stack = [mutate(initial_map_string, initial_action_sequence)]
+        while mutation_stack:
+            next_mutate_args = next(mutation_stack[-1], None)
+            if next_mutate_args is None:
+                mutation_stack.pop()
+            else:
+                mutation_stack.append(mutate(*next_mutate_args))
 
         self.__finish_run(generate_report=generate_report)
 
@@ -501,7 +1051,7 @@ class Fuzzer:
         :param partial: Whether this is a partial report. (If true, the report will have a different name.)
         :param name: Name of the report. (If None, a default name will be used: "report")
         """
-        report_start_time = time()
+        report_start_time = monotonic()
 
         output_path = self.config.get("output_path")
 
@@ -510,24 +1060,19 @@ class Fuzzer:
             "exit codes": {},
             "errors": {},
             "similar errors": {},
+            "duplicates": self.dedup_hits,
             "runtime": runtime or self.runtime()
         }
 
-        exit_codes = [history_item[1] for history_item in self.history]
-
-        for exit_code in set(exit_codes):
-            statistics["exit codes"][exit_code] = exit_codes.count(exit_code)
-
-        errors = [history_item[4] for history_item in self.history if history_item[1] != 0]
+        statistics["exit codes"] = dict(self._exit_codes)
 
         errors_counted = {}
         errors_same_short_key = {}
-        for error in set(errors):
+        for error, count in self._errors.items():
             error_short = error
             if len(error) > 40:
                 error_short = error[:40] + "..."
 
-            count = errors.count(error)
             same_count_to_add = count
             if error_short not in errors_counted:
                 errors_counted[error_short] = count
@@ -549,38 +1094,63 @@ class Fuzzer:
         statistics["similar errors"] = {error: count for error, count in
                                         sorted(errors_same_short_key.items(), key=lambda item: item[1], reverse=True)}
 
+        report_parts = []
+
+        report_parts.append(f"# JPacman Fuzzer Report\n\n")
+
+        report_parts.append(f"## Table of Contents\n\n")
+        report_parts.append(f"* [Configuration](#configuration)\n")
+        report_parts.append(f"* [Arguments](#arguments)\n")
+        report_parts.append(f"* [Statistics](#statistics)\n")
+        report_parts.append(f"* [History](#history)\n")
+
+        report_parts.append(f"## Configuration\n\n")
+        report_parts.append(f"```json\n{json.dumps(self.config, indent=4)}\n```\n\n")
+        report_parts.append(f"## Arguments\n\n")
+        report_parts.append(f"```bash\n--max_iterations: {self.max_iterations}\n")
+        report_parts.append(f"--max_time: {self.max_time}\n```\n\n")
+        report_parts.append(f"## Statistics\n\n")
+        report_parts.append(f"```json\n{json.dumps(statistics, indent=4)}\n```\n\n")
+        report_parts.append(f"## History\n\n")
+        report_parts.append(f"| Iteration | Exit Code | Map String | Action Sequence | Output | Notes |\n")
+        report_parts.append(f"| --------- | --------- | ---------- | --------------- | ------ | ----- |\n")
+
+        def format_cell(value) -> str | None:
+            """
+            Formats a history value as a markdown table cell, with every line as inline code.
+            :param value: History value.
+            :return: Formatted table cell.
+            """
+            if value is None or value == "":
+                return value
+            return ("`" + str(value).rstrip("\n").replace('\n', '`<br>`') + "`").replace("``", "")
+
+        # Outputs (mostly error messages) and, in mutation runs, maps & action sequences repeat a lot across
+        # iterations, so recently formatted cells are reused.
+        format_repeated_cell = lru_cache(maxsize=4096)(format_cell)
+
+        def format_row(entry: list) -> str:
+            """
+            Formats a history entry as a markdown table row.
+            :param entry: History entry.
+            :return: Formatted table row.
+            """
+            iteration, exit_code, map_string, action_sequence, process_output, note = entry
+
+            return (f"| {format_cell(iteration)} | {format_cell(exit_code)} | {format_repeated_cell(map_string)} | "
+                    f"{format_repeated_cell(action_sequence)} | {format_repeated_cell(process_output)} | "
+                    f"{format_cell(note)} |\n")
+
+        # Reports can get large, a big write buffer keeps the number of write calls down.
         with open(os.path.join(output_path, f"{name if name else 'report'}{'_temp' if partial else ''}.md"),
-                  "w") as report_file:
-            report_file.write(f"# JPacman Fuzzer Report\n\n")
-
-            report_file.write(f"## Table of Contents\n\n")
-            report_file.write(f"* [Configuration](#configuration)\n")
-            report_file.write(f"* [Arguments](#arguments)\n")
-            report_file.write(f"* [Statistics](#statistics)\n")
-            report_file.write(f"* [History](#history)\n")
-
-            report_file.write(f"## Configuration\n\n")
-            report_file.write(f"```json\n{json.dumps(self.config, indent=4)}\n```\n\n")
-            report_file.write(f"## Arguments\n\n")
-            report_file.write(f"```bash\n--max_iterations: {self.max_iterations}\n")
-            report_file.write(f"--max_time: {self.max_time}\n```\n\n")
-            report_file.write(f"## Statistics\n\n")
-            report_file.write(f"```json\n{json.dumps(statistics, indent=4)}\n```\n\n")
-            report_file.write(f"## History\n\n")
-            report_file.write(f"| Iteration | Exit Code | Map String | Action Sequence | Output | Notes |\n")
-            report_file.write(f"| --------- | --------- | ---------- | --------------- | ------ | ----- |\n")
-
-            for entry in self.history:
-                copy_entry = entry.copy()
-                for i in range(len(entry)):
-                    if copy_entry[i] not in ["", None]:
-                        copy_entry[i] = str(copy_entry[i]).rstrip("\n")
-                        copy_entry[i] = ("`" + copy_entry[i].replace('\n', '`<br>`') + "`").replace("``", "")
-                report_file.write(
-                    f"| {copy_entry[0]} | {copy_entry[1]} | {copy_entry[2]} | {copy_entry[3]} | {copy_entry[4]} | {copy_entry[5]} |\n")
-
-            report_file.write(f"\n\n> Report generated in {time() - report_start_time} seconds.")
+                  "w", buffering=1 << 20) as report_file:
+            report_file.write("".join(report_parts))
+
+            # Rows are streamed from the history file, so the history never has to fit in memory.
+            report_file.writelines(format_row(entry) for entry in self.iter_history())
+
+            report_file.write(f"\n\n> Report generated in {monotonic() - report_start_time} seconds.")
 
         if not partial:
-            self.logger.info(f"Report generated in {time() - report_start_time} seconds")
+            self.logger.info(f"Report generated in {monotonic() - report_start_time} seconds")
             self.logger.info(f"Report generated at {os.path.join(output_path, 'report.md')}")
@@ -0,0 +1,286 @@
+import os
+import subprocess
+import tempfile
+from logging import Logger
+from threading import Event, Timer
+from typing import BinaryIO
+
+# Recorded instead of an exit code when the launcher itself failed, rather than JPacman.
+LAUNCHER_ERROR = "launcher error"
+
+
+def read_result(stream: BinaryIO) -> (int, int, str):
+    """
+    Reads a single case result written by the launcher.
+    :param stream: Stream to read from.
+    :return: Case id, exit code (or "timeout" if JPacman would have hung) and output of JPacman.
+    :raises ValueError: If the stream does not contain a (complete) result.
+    """
+    header = stream.readline().decode(errors="replace")
+    fields = header[3:].split() if header.startswith("RC=") else []
+    if len(fields) != 3:
+        raise ValueError(f"Unexpected response from JPacman launcher: {header!r}")
+
+    return_code = fields[0] if fields[0] == "timeout" else int(fields[0])
+    output_length, case_id = int(fields[1]), int(fields[2])
+    output = stream.read(output_length)
+    if len(output) < output_length:
+        raise ValueError("Incomplete response from JPacman launcher")
+
+    return case_id, return_code, output.decode(errors="replace")
+
+
+def format_case(case_id: int, input_path: str, action_sequence: str) -> str:
+    """
+    Formats a single case for the launcher.
+    :param case_id: Id of the case, echoed back by the launcher with the result.
+    :param input_path: Path to the input map.
+    :param action_sequence: Action sequence to use.
+    :return: Case line, including the trailing newline.
+    """
+    # Line breaks (\n and \r, as Java's readLine splits on both) would break the line based protocol, so they are
+    # stripped from the action sequence.
+    return f"{case_id}\t{input_path}\t{action_sequence.replace(chr(10), '').replace(chr(13), '')}\n"
+
+
+class JPacmanWorker:
+    """
+    Long-lived JVM running the fuzzer launcher (see `jpacman/launcher`).
+
+    Cases are fed to the launcher over stdin as `<case id>\\t<map path>\\t<action sequence>` lines, the launcher answers
+    with a `RC=<exit code> <output length> <case id>` line followed by the captured output. This avoids paying the
+    JVM startup cost for every iteration.
+
+    A case where JPacman doesn't exit would hang a fresh JVM, the launcher answers it with `RC=timeout` and exits, so
+    the next case gets a fresh JVM.
+    """
+
+    def __init__(self, launcher_path: str, timeout: float, logger: Logger, java_path: str = "java") -> None:
+        """
+        Initializes the worker. The JVM itself is only started on the first case.
+        :param launcher_path: Path to the launcher jar.
+        :param timeout: Timeout for a single case in seconds. The JVM is killed & respawned when it is exceeded.
+        :param logger: Logger to use.
+        :param java_path: Path to the java executable.
+        """
+        self.launcher_path = launcher_path
+        self.timeout = timeout
+        self.logger = logger
+        self.java_path = java_path
+
+        self._process: subprocess.Popen | None = None
+        self._stderr: BinaryIO | None = None
+        self._stderr_logged: bool = False
+        self._timed_out: bool = False
+        self._case_id: int = 0
+
+        # Whether the launcher ever answered a case. If not, it most likely can't run at all (e.g. on a Java version
+        # without security manager support).
+        self.answered: bool = False
+
+    @staticmethod
+    def available(launcher_path: str) -> bool:
+        """
+        Checks if the launcher jar is available.
+        :param launcher_path: Path to the launcher jar.
+        :return: True if the launcher jar exists, False otherwise.
+        """
+        return bool(launcher_path) and os.path.isfile(launcher_path)
+
+    def __launcher_argv(self, *args: str) -> list:
+        """
+        Builds the command to start the launcher.
+        :param args: Extra arguments for the launcher.
+        :return: Launcher command, as an argument list.
+        """
+        # The launcher traps System.exit with a security manager, which Java 18+ only allows when asked for.
+        return [self.java_path, "-Djava.security.manager=allow", "-jar", self.launcher_path, *args]
+
+    def __start(self) -> None:
+        """
+        Starts the JVM.
+        """
+        # Only the launcher's responses go to stdout. The JVM's own messages on stderr (e.g. the security manager
+        # deprecation warning) go to a temporary file, so they can't be mistaken for a response but can still be
+        # logged when the launcher fails.
+        if self._stderr:
+            self._stderr.close()
+        self._stderr = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(self.__launcher_argv(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=self._stderr)
+        self.logger.debug(f"JPacman worker started (pid {self._process.pid}).")
+
+    def __kill(self) -> None:
+        """
+        Kills the JVM, used by the watchdog when a case exceeds the timeout.
+        """
+        self._timed_out = True
+        self._process.kill()
+
+    def __log_stderr(self, stderr_file: BinaryIO) -> None:
+        """
+        Logs what the JVM wrote to stderr, once, if the launcher never answered a case.
+        :param stderr_file: File the JVM's stderr was written to.
+        """
+        if self.answered or self._stderr_logged:
+            return
+
+        self._stderr_logged = True
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors="replace").strip()
+        self.logger.warning(f"JPacman launcher never answered a case, its stderr was:\n{stderr or '(empty)'}")
+
+    def run(self, input_path: str, action_sequence: str) -> (int | str, str):
+        """
+        Runs a single case on the worker. If the launcher fails, the case is retried once on a fresh JVM.
+        :param input_path: Path to the input map.
+        :param action_sequence: Action sequence to use.
+        :return: Exit code (or "timeout", or LAUNCHER_ERROR if the launcher failed twice) and output of JPacman.
+        """
+        for _ in range(2):
+            result = self.__run_once(input_path, action_sequence)
+            if result is not None:
+                return result
+
+        self.__log_stderr(self._stderr)
+        return LAUNCHER_ERROR, ""
+
+    def __run_once(self, input_path: str, action_sequence: str) -> tuple | None:
+        """
+        Runs a single case on the worker, (re)starting the JVM if needed.
+        :param input_path: Path to the input map.
+        :param action_sequence: Action sequence to use.
+        :return: Exit code (or "timeout") and output of JPacman, or None if the launcher failed.
+        """
+        if self._process is None or self._process.poll() is not None:
+            self.__start()
+
+        self._timed_out = False
+        self._case_id += 1
+        watchdog = None
+        if self.timeout:
+            watchdog = Timer(self.timeout, self.__kill)
+            watchdog.daemon = True
+            watchdog.start()
+
+        try:
+            self._process.stdin.write(format_case(self._case_id, input_path, action_sequence).encode())
+            self._process.stdin.flush()
+
+            case_id, return_code, output = read_result(self._process.stdout)
+            if case_id != self._case_id:
+                raise ValueError(f"JPacman launcher answered case {case_id} instead of case {self._case_id}")
+        except (BrokenPipeError, ValueError) as e:
+            # The JVM is gone, it will be respawned on the next case.
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+
+            if self._timed_out:
+                return "timeout", ""
+
+            self.logger.warning(f"JPacman launcher failed: {e}")
+            return None
+        finally:
+            if watchdog:
+                watchdog.cancel()
+
+        self.answered = True
+
+        if return_code == "timeout":
+            # The launcher exits after a hanging case.
+            self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+
+        return return_code, output
+
+    def run_batch(self, index_path: str, cases: list) -> list:
+        """
+        Runs a batch of cases on a fresh JVM, which exits once the batch is done.
+        The cases run in order, each with its own timeout. If the batch is cut short, the case that was running is
+        reported as "timeout" (or LAUNCHER_ERROR if the JVM died), and the cases after it as None, as they never ran.
+        The launcher also stops early after a case reported as "timeout", the cases after that one are None too.
+        :param index_path: Path to write the batch index file to.
+        :param cases: List of (input path, action sequence) tuples.
+        :return: List of (exit code (or "timeout"), output) tuples or None, in the same order as the cases.
+        """
+        with open(index_path, "w") as index_file:
+            for case_id, (input_path, action_sequence) in enumerate(cases):
+                index_file.write(format_case(case_id, input_path, action_sequence))
+
+        # Results are matched to cases by the echoed case id, never by position.
+        answered = {}
+        return_code = None
+        timed_out = Event()
+        with tempfile.TemporaryFile() as stderr_file:
+            batch_process = subprocess.Popen(self.__launcher_argv("--batch", index_path), stdin=subprocess.DEVNULL,
+                                             stdout=subprocess.PIPE, stderr=stderr_file)
+
+            def kill() -> None:
+                timed_out.set()
+                batch_process.kill()
+
+            # Results are read as the launcher writes them, so every case gets the timeout on its own.
+            for _ in cases:
+                watchdog = None
+                if self.timeout:
+                    watchdog = Timer(self.timeout, kill)
+                    watchdog.daemon = True
+                    watchdog.start()
+
+                try:
+                    case_id, return_code, output = read_result(batch_process.stdout)
+                except ValueError as e:
+                    self.logger.warning("JPacman batch case timed out" if timed_out.is_set()
+                                        else f"JPacman batch cut short: {e}")
+                    return_code = None
+                    break
+                finally:
+                    if watchdog:
+                        watchdog.cancel()
+
+                answered[case_id] = (return_code, output)
+                self.answered = True
+                if return_code == "timeout":
+                    break
+
+            batch_process.kill()
+            batch_process.wait()
+            batch_process.stdout.close()
+
+            if not answered and not timed_out.is_set():
+                self.__log_stderr(stderr_file)
+
+        results = []
+        # After a hanging case the launcher exits on its own, so none of the remaining cases ran.
+        cut_short = return_code == "timeout"
+        for case_id in range(len(cases)):
+            if case_id in answered:
+                results.append(answered[case_id])
+            elif not cut_short:
+                # Cases run in order, so the first unanswered case is the one that was running.
+                cut_short = True
+                results.append(("timeout", "") if timed_out.is_set() else (LAUNCHER_ERROR, ""))
+            else:
+                results.append(None)
+
+        return results
+
+    def close(self) -> None:
+        """
+        Stops the JVM by closing its stdin.
+        """
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=self.timeout or None)
+            except (BrokenPipeError, subprocess.TimeoutExpired):
+                self._process.kill()
+                self._process.wait()
+
+            self._process = None
+
+        if self._stderr:
+            self._stderr.close()
+            self._stderr = None
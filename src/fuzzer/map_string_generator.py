@@ -5,6 +5,12 @@ from random import Random
 
 from .enums import MapItem
 
+_BINARY_VALUES = ("0", "1")
+_MAP_ITEM_VALUES = tuple(map_item.value for map_item in MapItem)
+_NON_PLAYER_MAP_ITEM_VALUES = tuple(map_item.value for map_item in MapItem if map_item is not MapItem.PLAYER)
+# Cells that may be replaced to place a missing food or player, in order of preference.
+_FALLBACK_MAP_ITEM_VALUES = (MapItem.EMPTY.value, MapItem.WALL.value, MapItem.MONSTER.value)
+
 
 class BaseMapStringGenerator(ABC):
     """
@@ -63,26 +69,44 @@ class BaseMapStringGenerator(ABC):
         """
         raise NotImplementedError()
 
+    def _generate_chars(self, count: int, *args, **kwargs) -> list:
+        """
+        Generate the next characters in the map string.
+        :param count: Number of characters to generate.
+        :return: List of generated characters.
+        """
+        return [self._generate_char(*args, **kwargs) for _ in range(count)]
+
 
 class C0MapStringGenerator(BaseMapStringGenerator):
     """
     Generator for map strings with correctness 0.
 
     Random binary string map.
+
+    Subclasses pick the characters to draw from by setting `_char_population`, which lets a whole map be drawn in a
+    single call. Subclasses that override `_generate_char` instead are still supported, their characters are generated
+    one at a time.
     """
 
+    # Characters to draw the map from, all at once.
+    _char_population = _BINARY_VALUES
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Read once, the map size doesn't change between maps.
+        self.max_width, self.max_height = self.config.get("max_map_size")
+
     def _generate(self, *args, **kwargs) -> None:
-        max_map_size = self.config.get("max_map_size")
-        max_width = kwargs.get("max_width") or max_map_size[0]
-        max_height = kwargs.get("max_height") or max_map_size[1]
+        max_width = kwargs.get("max_width") or self.max_width
+        max_height = kwargs.get("max_height") or self.max_height
 
         actual_width = kwargs.get("width") or self.random.randint(kwargs.get("min_width") or 1, max_width)
         actual_height = kwargs.get("height") or self.random.randint(kwargs.get("min_height") or 1, max_height)
 
-        for y in range(actual_height):
-            for x in range(actual_width):
-                self.map_string += self._generate_char()
-            self.map_string += "\n"
+        chars = self._generate_chars(actual_width * actual_height)
+        self.map_string = "".join(["".join(chars[row:row + actual_width]) + "\n"
+                                   for row in range(0, len(chars), actual_width)])
 
     def _pre_generate(self, *args, **kwargs) -> None:
         self.map_string = ""
@@ -91,7 +115,19 @@ class C0MapStringGenerator(BaseMapStringGenerator):
         pass
 
     def _generate_char(self, *args, **kwargs) -> str:
-        return str(self.random.randint(0, 1))
+        return self.random.choice(self._char_population)
+
+    def _generate_chars(self, count: int, *args, **kwargs) -> list:
+        if not self._uses_char_population():
+            return super()._generate_chars(count, *args, **kwargs)
+        return self.random.choices(self._char_population, k=count)
+
+    def _uses_char_population(self) -> bool:
+        """
+        Checks if characters are drawn from `_char_population`, rather than from an overridden `_generate_char`.
+        :return: True if `_generate_char` is not overridden, False otherwise.
+        """
+        return type(self)._generate_char is C0MapStringGenerator._generate_char
 
 
 class C1MapStringGenerator(C0MapStringGenerator):
@@ -101,8 +137,7 @@ class C1MapStringGenerator(C0MapStringGenerator):
     Random alphabetical string map.
     """
 
-    def _generate_char(self, *args, **kwargs) -> str:
-        return self.random.choice(string.ascii_letters)
+    _char_population = string.ascii_letters
 
 
 class C2MapStringGenerator(C0MapStringGenerator):
@@ -112,8 +147,7 @@ class C2MapStringGenerator(C0MapStringGenerator):
     Random choice of valid map characters.
     """
 
-    def _generate_char(self, *args, **kwargs) -> str:
-        return self.random.choice(list(MapItem)).value
+    _char_population = _MAP_ITEM_VALUES
 
 
 class C3MapStringGenerator(C2MapStringGenerator):
@@ -135,38 +169,49 @@ class C3MapStringGenerator(C2MapStringGenerator):
         super()._post_generate(*args, **kwargs)
 
         # Ensure there is at least 1 food item to prevent map being invalid.
-        if self.map_string.count(MapItem.FOOD.value) == 0:
-            if self.map_string.count(MapItem.EMPTY.value) > 0:
-                self.map_string = self.map_string.replace(MapItem.EMPTY.value, MapItem.FOOD.value, 1)
-            elif self.map_string.count(MapItem.WALL.value) > 0:
-                self.map_string = self.map_string.replace(MapItem.WALL.value, MapItem.FOOD.value, 1)
-            elif self.map_string.count(MapItem.MONSTER.value) > 0:
-                self.map_string = self.map_string.replace(MapItem.MONSTER.value, MapItem.FOOD.value, 1)
-            else:
-                self.logger.warning("Could not find a valid character to replace with food.")
+        if MapItem.FOOD.value not in self.map_string and not self.__replace_first_fallback(MapItem.FOOD):
+            self.logger.warning("Could not find a valid character to replace with food.")
 
         # Ensure at least 1 player is generated.
-        if self.map_string.count(MapItem.PLAYER.value) == 0:
-            if self.map_string.count(MapItem.EMPTY.value) > 0:
-                self.map_string = self.map_string.replace(MapItem.EMPTY.value, MapItem.PLAYER.value, 1)
-            elif self.map_string.count(MapItem.WALL.value) > 0:
-                self.map_string = self.map_string.replace(MapItem.WALL.value, MapItem.PLAYER.value, 1)
-            elif self.map_string.count(MapItem.MONSTER.value) > 0:
-                self.map_string = self.map_string.replace(MapItem.MONSTER.value, MapItem.PLAYER.value, 1)
-            else:
-                self.logger.warning("Could not find a valid character to replace with player.")
+        if MapItem.PLAYER.value not in self.map_string and not self.__replace_first_fallback(MapItem.PLAYER):
+            self.logger.warning("Could not find a valid character to replace with player.")
+
+    def __replace_first_fallback(self, map_item: MapItem) -> bool:
+        """
+        Replaces the first empty cell with the given map item, falling back to the first wall and then the first
+        monster if there are none.
+        :param map_item: Map item to place.
+        :return: True if a cell was replaced, False otherwise.
+        """
+        for fallback_value in _FALLBACK_MAP_ITEM_VALUES:
+            index = self.map_string.find(fallback_value)
+            if index >= 0:
+                self.map_string = self.map_string[:index] + map_item.value + self.map_string[index + 1:]
+                return True
+
+        return False
+
+    def _generate_chars(self, count: int, *args, **kwargs) -> list:
+        chars = super()._generate_chars(count, *args, **kwargs)
 
-    def _generate_char(self, *args, **kwargs) -> str:
         # Ensure at most 1 player is generated.
-        if not self.player_generated:
-            map_item = super()._generate_char(*args, **kwargs)
-            if map_item == MapItem.PLAYER.value:
-                self.player_generated = True
-            return map_item
-        else:
-            valid_map_items = list(MapItem)
-            valid_map_items.remove(MapItem.PLAYER)
-            return self.random.choice(valid_map_items).value
+        try:
+            first_player = chars.index(MapItem.PLAYER.value)
+        except ValueError:
+            return chars
+
+        self.player_generated = True
+
+        if self._uses_char_population():
+            # Everything after the first player is drawn again, without players.
+            chars[first_player + 1:] = self.random.choices(_NON_PLAYER_MAP_ITEM_VALUES, k=count - first_player - 1)
+            return chars
+
+        # Characters from an overridden _generate_char are kept, only the extra players are replaced.
+        for index in range(first_player + 1, count):
+            if chars[index] == MapItem.PLAYER.value:
+                chars[index] = self.random.choice(_NON_PLAYER_MAP_ITEM_VALUES)
+        return chars
 
 
 map_string_generators = {0: C0MapStringGenerator,